@@ -1,15 +1,34 @@
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
-
 class Config:
     """Configuration class for application settings"""
-    
-    SPOTIFY_CLIENT_ID = os.getenv('SPOTIFY_CLIENT_ID', 'your_client_id_here')
-    SPOTIFY_CLIENT_SECRET = os.getenv('SPOTIFY_CLIENT_SECRET', 'your_client_secret_here')
-    SPOTIFY_REDIRECT_URI = os.getenv('SPOTIFY_REDIRECT_URI', 'http://127.0.0.1:8080/callback')
-    
+
+    SPOTIFY_CLIENT_ID = 'your_client_id_here'
+    SPOTIFY_CLIENT_SECRET = 'your_client_secret_here'
+    SPOTIFY_REDIRECT_URI = 'http://127.0.0.1:8080/callback'
+
+    _loaded = False
+
+    @classmethod
+    def load(cls):
+        """
+        Load Spotify credentials from the environment/.env file
+
+        Deferred from import time so importing this module does no file
+        I/O; the first call reads .env once and later calls are free.
+
+        Returns:
+            type: The Config class with credentials populated
+        """
+        if not cls._loaded:
+            load_dotenv()
+            cls.SPOTIFY_CLIENT_ID = os.getenv('SPOTIFY_CLIENT_ID', cls.SPOTIFY_CLIENT_ID)
+            cls.SPOTIFY_CLIENT_SECRET = os.getenv('SPOTIFY_CLIENT_SECRET', cls.SPOTIFY_CLIENT_SECRET)
+            cls.SPOTIFY_REDIRECT_URI = os.getenv('SPOTIFY_REDIRECT_URI', cls.SPOTIFY_REDIRECT_URI)
+            cls._loaded = True
+        return cls
+
     MOOD_MAPPING = {
         'happy': ['happy', 'party', 'upbeat', 'energetic', 'dance'],
         'sad': ['sad', 'melancholy', 'blues', 'emotional', 'heartbreak'],
@@ -20,9 +39,15 @@ class Config:
         'neutral': ['chill', 'lofi', 'background', 'study', 'focus']
     }
     
+    # Precomputed at import so recommendations don't rebuild keyword
+    # lists or re-join them for logging on every detection
+    MOOD_KEYWORDS = {mood: tuple(words) for mood, words in MOOD_MAPPING.items()}
+    MOOD_KEYWORDS_JOINED = {mood: ', '.join(words) for mood, words in MOOD_MAPPING.items()}
+
     CAMERA_INDEX = 0
     FRAME_WIDTH = 640
     FRAME_HEIGHT = 480
     
     DETECTION_CONFIDENCE = 0.7
-    FRAME_SKIP = 30  
\ No newline at end of file
+    PROCESS_FPS = 10
+    PREVIEW_FPS = 30
\ No newline at end of file
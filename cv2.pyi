@@ -5,17 +5,35 @@ def VideoCapture(index: int) -> Any: ...
 def rectangle(img: np.ndarray, pt1: Tuple[int, int], pt2: Tuple[int, int], color: Tuple[int, int, int], thickness: int) -> None: ...
 def addWeighted(src1: np.ndarray, alpha: float, src2: np.ndarray, beta: float, gamma: float, dst: Optional[np.ndarray] = ...) -> np.ndarray: ...
 def putText(img: np.ndarray, text: str, org: Tuple[int, int], fontFace: int, fontScale: float, color: Tuple[int, int, int], thickness: int = ...) -> None: ...
+def getTextSize(text: str, fontFace: int, fontScale: float, thickness: int) -> Tuple[Tuple[int, int], int]: ...
 def imshow(winname: str, mat: np.ndarray) -> None: ...
 def waitKey(delay: int = ...) -> int: ...
+def pollKey() -> int: ...
 def flip(src: np.ndarray, flipCode: int) -> np.ndarray: ...
 def destroyAllWindows() -> None: ...
 def cvtColor(src: np.ndarray, code: int) -> np.ndarray: ...
 def CascadeClassifier(filename: str) -> Any: ...
+def resize(src: np.ndarray, dsize: Tuple[int, int], fx: float = ..., fy: float = ...) -> np.ndarray: ...
+def FaceDetectorYN_create(model: str, config: str, input_size: Tuple[int, int]) -> Any: ...
+
+def VideoWriter_fourcc(*args: str) -> int: ...
 
 FONT_HERSHEY_SIMPLEX: int
 COLOR_BGR2GRAY: int
+COLOR_YUV2BGR_YUYV: int
 CAP_PROP_FRAME_WIDTH: int
 CAP_PROP_FRAME_HEIGHT: int
+CAP_PROP_BUFFERSIZE: int
+CAP_PROP_FOURCC: int
+CAP_PROP_CONVERT_RGB: int
+
+class UMat:
+    def __init__(self, m: np.ndarray) -> None: ...
+    def get(self) -> np.ndarray: ...
+
+class ocl:
+    @staticmethod
+    def haveOpenCL() -> bool: ...
 
 class data:
     haarcascades: str
\ No newline at end of file
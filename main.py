@@ -1,7 +1,9 @@
 import cv2
+import numpy as np
 import time
 import sys
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple
 from config import Config
 from mood_detector import MoodDetector
@@ -23,7 +25,7 @@ class MoodPlaylistRecommender:
     
     def __init__(self):
         """Initialize the mood playlist recommender"""
-        self.config = Config()
+        self.config = Config.load()
         self.mood_detector = MoodDetector(
             camera_index=self.config.CAMERA_INDEX,
             frame_width=self.config.FRAME_WIDTH,
@@ -36,6 +38,30 @@ class MoodPlaylistRecommender:
         )
         self.last_recommendation_time = 0
         self.recommendation_cooldown = 10  # seconds
+
+        # Playlist searches run on a worker thread while the camera is still
+        # detecting, so the HTTP round trip hides behind capture; recent
+        # results are reused per keyword set for a few minutes
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=1)
+        self._prefetch_futures: dict = {}
+        self._playlist_cache: dict = {}
+        self._playlist_cache_ttl = 300  # seconds
+
+        # Pre-rendered overlay assets: the translucent box is blended over
+        # a 290x90 ROI instead of copying and re-blending the whole frame,
+        # and the static title is rasterized once and blitted with a mask
+        self._overlay_box = np.zeros((90, 290, 3), np.uint8)
+        self._blend_buf = np.empty((90, 290, 3), np.uint8)
+        self._title_img = np.zeros((90, 290, 3), np.uint8)
+        cv2.putText(self._title_img, "Mood Playlist Recommender", (10, 25),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        self._title_mask = self._title_img.any(axis=2)
+        # Rendered text bitmaps keyed by (text, color, scale, thickness);
+        # there are only a handful of distinct overlay strings, so drawing
+        # becomes a small masked blit instead of glyph rasterization
+        self._text_cache: dict = {}
+        self._last_mood: Optional[str] = None
+        self._last_mood_line = ""
         
     def initialize(self) -> bool:
         """Initialize all components"""
@@ -60,49 +86,96 @@ class MoodPlaylistRecommender:
         logger.info("Initialization complete!")
         return True
     
-    def get_mood_keywords(self, detected_mood: str) -> list:
+    def get_mood_keywords(self, detected_mood: str) -> tuple:
         """
         Get playlist keywords based on detected mood
-        
+
         Args:
             detected_mood (str): Detected emotion/mood
-            
+
         Returns:
-            list: List of keywords for playlist search
+            tuple: Keywords for playlist search
         """
-        return self.config.MOOD_MAPPING.get(detected_mood, self.config.MOOD_MAPPING['neutral'])
+        return self.config.MOOD_KEYWORDS.get(detected_mood, self.config.MOOD_KEYWORDS['neutral'])
     
+    def _fetch_playlist(self, mood: str):
+        """
+        Fetch a playlist recommendation for a mood, reusing recent results
+
+        Args:
+            mood (str): Detected mood/emotion
+
+        Returns:
+            PlaylistInfo: Playlist record or None
+        """
+        keywords = self.get_mood_keywords(mood)
+        cached = self._playlist_cache.get(keywords)
+        if cached and time.time() - cached[1] < self._playlist_cache_ttl:
+            logger.info(f"Using cached playlist results for mood: {mood}")
+            return cached[0]
+
+        playlist = self.spotify_client.get_mood_playlist_recommendation(keywords)
+        if playlist:
+            self._playlist_cache[keywords] = (playlist, time.time())
+        return playlist
+
+    def _prefetch_playlist(self, mood: str) -> None:
+        """
+        Start fetching a recommendation in the background for a candidate mood
+
+        Args:
+            mood (str): Mood currently leading the stability window
+        """
+        future = self._prefetch_futures.get(mood)
+        if future is not None:
+            if not future.done():
+                return
+            # A finished fetch already stored its result (with timestamp)
+            # in _playlist_cache; drop the future so the TTL decides below
+            del self._prefetch_futures[mood]
+
+        cached = self._playlist_cache.get(self.get_mood_keywords(mood))
+        if cached and time.time() - cached[1] < self._playlist_cache_ttl:
+            return
+
+        self._prefetch_futures[mood] = self._prefetch_pool.submit(self._fetch_playlist, mood)
+
     def recommend_playlist(self, mood: str) -> bool:
         """
         Recommend playlist based on detected mood
-        
+
         Args:
             mood (str): Detected mood/emotion
-            
+
         Returns:
             bool: True if playlist was successfully recommended
         """
         logger.info(f"🎭 Detected mood: {mood.upper()}")
-        
-        # Get mood-based keywords
-        keywords = self.get_mood_keywords(mood)
-        logger.info(f"🔍 Searching for playlists with keywords: {', '.join(keywords)}")
-        
-        # Get playlist recommendation
-        playlist = self.spotify_client.get_mood_playlist_recommendation(keywords)
+
+        joined = self.config.MOOD_KEYWORDS_JOINED.get(mood, self.config.MOOD_KEYWORDS_JOINED['neutral'])
+        logger.info(f"🔍 Searching for playlists with keywords: {joined}")
+
+        # Wait on a still-running prefetch; a completed one already put its
+        # result in _playlist_cache, so _fetch_playlist serves it if the
+        # TTL allows and refetches otherwise
+        future = self._prefetch_futures.pop(mood, None)
+        if future is not None and not future.done():
+            playlist = future.result()
+        else:
+            playlist = self._fetch_playlist(mood)
         
         if playlist:
             print("\n" + "="*60)
             print(f"🎵 PLAYLIST RECOMMENDATION FOR '{mood.upper()}' MOOD:")
-            print(f"📝 Name: {playlist['name']}")
-            print(f"👤 Creator: {playlist['owner']}")
-            print(f"🎶 Tracks: {playlist['tracks_count']}")
-            print(f"📋 Description: {playlist['description'][:100]}...")
-            print(f"🔗 URL: {playlist['url']}")
+            print(f"📝 Name: {playlist.name}")
+            print(f"👤 Creator: {playlist.owner}")
+            print(f"🎶 Tracks: {playlist.tracks_count}")
+            print(f"📋 Description: {playlist.description[:100]}...")
+            print(f"🔗 URL: {playlist.url}")
             print("="*60)
             
             # Open playlist in browser
-            self.spotify_client.open_playlist_in_browser(playlist['url'])
+            self.spotify_client.open_playlist_in_browser(playlist.url)
             
             self.last_recommendation_time = time.time()
             return True
@@ -110,6 +183,39 @@ class MoodPlaylistRecommender:
             logger.warning(f"No playlist found for mood: {mood}")
             return False
     
+    def _draw_text(self, frame, text: str, org: Tuple[int, int], scale: float,
+                   color: Tuple[int, int, int], thickness: int) -> None:
+        """
+        Draw text using a cached glyph bitmap
+
+        The first draw of a given (text, color, scale, thickness) renders it
+        once with cv2.putText onto a small tile; later draws paste the tile
+        with a precomputed mask, skipping glyph rasterization entirely.
+
+        Args:
+            frame: OpenCV frame to draw on
+            text (str): Text to draw
+            org (tuple): Bottom-left origin, as for cv2.putText
+            scale (float): Font scale
+            color (tuple): BGR text color
+            thickness (int): Stroke thickness
+        """
+        key = (text, color, scale, thickness)
+        entry = self._text_cache.get(key)
+        if entry is None:
+            (width, height), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+            tile = np.zeros((height + baseline, width, 3), np.uint8)
+            cv2.putText(tile, text, (0, height), cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+            entry = (tile, tile.any(axis=2), height)
+            self._text_cache[key] = entry
+
+        tile, mask, height = entry
+        x, y = org
+        top = y - height
+        roi = frame[top:top + tile.shape[0], x:x + tile.shape[1]]
+        if roi.shape[:2] == mask.shape:
+            roi[mask] = tile[mask]
+
     def draw_overlay(self, frame, detected_mood: Optional[str] = None, detection_count: int = 0, required_stability: int = 3) -> None:
         """
         Draw overlay information on the frame
@@ -120,23 +226,31 @@ class MoodPlaylistRecommender:
             detection_count (int): Current detection count
             required_stability (int): Required stable detections
         """
-        # Add semi-transparent overlay
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (10, 10), (300, 100), (0, 0, 0), -1)
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
-        
-        # Add text
-        cv2.putText(frame, "Mood Playlist Recommender", (20, 35), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
-        
+        # Blend the semi-transparent box over its ROI only, then paste the
+        # cached title bitmap on top; skipped when the camera delivered a
+        # frame too small for the fixed 290x90 box (same shape guard as
+        # _draw_text)
+        roi = frame[10:100, 10:300]
+        if roi.shape == self._overlay_box.shape:
+            cv2.addWeighted(self._overlay_box, 0.7, roi, 0.3, 0, dst=self._blend_buf)
+            np.copyto(roi, self._blend_buf)
+            roi[self._title_mask] = self._title_img[self._title_mask]
+
+
         if detected_mood:
-            cv2.putText(frame, f"Mood: {detected_mood.upper()}", (20, 60), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-            cv2.putText(frame, f"Stability: {detection_count}/{required_stability}", (20, 85), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+            # The mood line only changes when the mood does
+            if detected_mood != self._last_mood:
+                self._last_mood = detected_mood
+                self._last_mood_line = f"Mood: {detected_mood.upper()}"
+            lines = (
+                (self._last_mood_line, (20, 60), 0.6, (0, 255, 0), 2),
+                (f"Stability: {detection_count}/{required_stability}", (20, 85), 0.5, (255, 255, 0), 1),
+            )
         else:
-            cv2.putText(frame, "Analyzing...", (20, 60), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+            lines = (("Analyzing...", (20, 60), 0.6, (255, 255, 0), 2),)
+
+        for text, org, scale, color, thickness in lines:
+            self._draw_text(frame, text, org, scale, color, thickness)
     
     def ask_try_again(self) -> bool:
         """
@@ -168,45 +282,75 @@ class MoodPlaylistRecommender:
         logger.info("📷 Look at the camera and show your emotion!")
         logger.info("⌨️  Press 'q' to quit early")
         
-        last_mood: Optional[str] = None
+        required_stability = 3  # Require same mood for 3 of the last detections
+        stability_window = 8  # Recent detections considered for stability
+
+        # O(1) sliding-window histogram over mood labels: a detection bumps
+        # its bucket and evicts the oldest, so one stray label no longer
+        # resets the whole count to 1
+        moods = list(self.config.MOOD_MAPPING)
+        mood_index = {mood: i for i, mood in enumerate(moods)}
+        hist = np.zeros(len(moods), dtype=np.int32)
+        ring = np.full(stability_window, -1, dtype=np.int32)
+        ring_pos = 0
+
+        stable_mood: Optional[str] = None
         mood_stability_count = 0
-        required_stability = 3  # Require same mood for 3 consecutive detections
-        
+
         try:
-            while mood_stability_count < required_stability:
+            while stable_mood is None:
                 # Capture and detect mood
-                detected_mood, frame = self.mood_detector.capture_and_detect(
-                    frame_skip=self.config.FRAME_SKIP
+                detected_mood, frame, did_process = self.mood_detector.capture_and_detect(
+                    target_fps=self.config.PROCESS_FPS,
+                    preview_fps=self.config.PREVIEW_FPS
                 )
-                
+
                 if frame is not None:
-                    # Draw overlay on frame
-                    self.draw_overlay(frame, detected_mood, mood_stability_count, required_stability)
-                    
-                    # Display frame
+                    # Draw overlay on frame; preview frames between
+                    # detections keep showing the current leading mood
+                    shown_mood = detected_mood
+                    if shown_mood is None and hist.max() > 0:
+                        shown_mood = moods[int(hist.argmax())]
+                    self.draw_overlay(frame, shown_mood, mood_stability_count, required_stability)
+
+                    # Display frame and pump the GUI event loop
                     cv2.imshow('Mood-Based Playlist Recommender', frame)
-                
+                    key = cv2.waitKey(1) & 0xFF
+                else:
+                    # No frame drawn: poll for a key without the ~1ms waitKey
+                    # stall, then yield briefly so throttled loops don't spin
+                    key = cv2.pollKey() & 0xFF
+                    time.sleep(0.001)
+
                 # Handle mood stability
-                if detected_mood:
-                    if detected_mood == last_mood:
-                        mood_stability_count += 1
-                        logger.info(f"Mood stability: {mood_stability_count}/{required_stability} - {detected_mood}")
-                    else:
-                        last_mood = detected_mood
-                        mood_stability_count = 1
-                        logger.info(f"New mood detected: {detected_mood}")
-                
+                if detected_mood and detected_mood in mood_index:
+                    idx = mood_index[detected_mood]
+                    oldest = ring[ring_pos]
+                    if oldest >= 0:
+                        hist[oldest] -= 1
+                    hist[idx] += 1
+                    ring[ring_pos] = idx
+                    ring_pos = (ring_pos + 1) % stability_window
+
+                    mood_stability_count = int(hist[idx])
+                    logger.info(f"Mood stability: {mood_stability_count}/{required_stability} - {detected_mood}")
+
+                    # Start the playlist search while the user is still on camera
+                    self._prefetch_playlist(detected_mood)
+
+                    if hist.max() >= required_stability:
+                        stable_mood = moods[int(hist.argmax())]
+
                 # Handle keyboard input
-                key = cv2.waitKey(1) & 0xFF
                 if key == ord('q'):
                     logger.info("Detection cancelled by user")
                     cv2.destroyAllWindows()
                     return None
-            
+
             # Close camera window after successful detection
             cv2.destroyAllWindows()
-            logger.info(f"✅ Mood detection complete: {last_mood}")
-            return last_mood
+            logger.info(f"✅ Mood detection complete: {stable_mood}")
+            return stable_mood
             
         except Exception as e:
             logger.error(f"Error during mood detection: {e}")
@@ -236,10 +380,7 @@ class MoodPlaylistRecommender:
                 # Ask if user wants to try again
                 if not self.ask_try_again():
                     break
-                
-                # Small delay before next cycle
-                time.sleep(1)
-                
+
         except KeyboardInterrupt:
             logger.info("Application interrupted by user")
         
@@ -248,6 +389,8 @@ class MoodPlaylistRecommender:
         
         finally:
             # Cleanup
+            self._prefetch_pool.shutdown(wait=False)
+            self.spotify_client.close()
             self.mood_detector.release()
             cv2.destroyAllWindows()
             logger.info("Application terminated successfully")
@@ -2,11 +2,61 @@ import cv2
 import numpy as np
 import random
 import logging
+import threading
 import time
 
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+EMOTION_MODEL_PATH = 'emotion.onnx'
+FACE_MODEL_PATH = 'face_detection_yunet.onnx'
+EMOTION_BATCH_SIZE = 16
+EMOTION_INPUT_SIZE = 64
+DNN_FAILURE_LIMIT = 3  # Consecutive inference errors before disabling the DNN
+
+# Output order of the FER+ emotion model; contempt is folded into neutral
+# since the app has no mapping for it
+DNN_EMOTIONS = ('neutral', 'happy', 'surprise', 'sad',
+                'angry', 'disgust', 'fear', 'neutral')
+
+
+def _emotion_index(faces, smiles, eyes):
+    """
+    Map raw feature counts to an index into MoodDetector.emotions
+
+    Kept as a free function over plain ints so numba can compile it when
+    available; returns -1 when no face was detected.
+
+    Args:
+        faces (int): Number of detected faces
+        smiles (int): Number of detected smiles
+        eyes (int): Number of detected eyes
+
+    Returns:
+        int: Emotion index or -1
+    """
+    if faces == 0:
+        return -1
+    if smiles > 0:
+        return 0  # happy
+    if eyes >= 2:
+        return 2  # neutral
+    return 1  # sad
+
+
+if njit is not None:
+    _emotion_index = njit(cache=True)(_emotion_index)
+
 class MoodDetector:
     """Class for detecting mood from facial expressions using basic OpenCV"""
     
@@ -23,7 +73,12 @@ class MoodDetector:
         self.frame_width = frame_width
         self.frame_height = frame_height
         self.cap = None
-        self.frame_count = 0
+        self._last_proc = 0.0
+        self._last_preview = 0.0
+        self._latest = None
+        self._frame_lock = threading.Lock()
+        self._capture_thread = None
+        self._running = False
         
         try:
             self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
@@ -36,10 +91,51 @@ class MoodDetector:
             self.smile_cascade = None
             self.eye_cascade = None
         
+        # Dispatch color conversion/resize/cascade detection to OpenCL via
+        # cv2.UMat when a device is available; ops fall back to CPU otherwise
+        try:
+            self._use_opencl = bool(cv2.ocl.haveOpenCL())
+        except AttributeError:
+            self._use_opencl = False
+        if self._use_opencl:
+            logger.info("OpenCL device available, using UMat for image ops")
+
         self.emotions = ['happy', 'sad', 'neutral', 'angry', 'surprise']
         self.current_emotion_index = 0
         self.last_emotion_time = time.time()
-        self.emotion_duration = 10  
+        self.emotion_duration = 10
+
+        # Batched DNN emotion path: one ONNX inference covers the last
+        # EMOTION_BATCH_SIZE face crops instead of three cascade passes per frame
+        self.session = None
+        self.face_detector = None
+        self._batch = None
+        self._batch_idx = 0
+        self._batch_full = False
+        self._input_name = None
+        self._dnn_failures = 0
+        if onnxruntime is not None:
+            try:
+                self.session = onnxruntime.InferenceSession(
+                    EMOTION_MODEL_PATH,
+                    providers=['CUDAExecutionProvider', 'CPUExecutionProvider']
+                )
+                # Exported models name their input tensor differently
+                # (the stock FER+ export uses 'Input3')
+                self._input_name = self.session.get_inputs()[0].name
+                self.face_detector = cv2.FaceDetectorYN_create(
+                    FACE_MODEL_PATH, '', (frame_width, frame_height)
+                )
+                self._batch = np.zeros(
+                    (EMOTION_BATCH_SIZE, 1, EMOTION_INPUT_SIZE, EMOTION_INPUT_SIZE),
+                    dtype=np.float32
+                )
+                logger.info("ONNX emotion model loaded, batched DNN inference enabled")
+            except Exception as e:
+                logger.warning(f"ONNX emotion model unavailable, falling back to cascades: {e}")
+                self.session = None
+                self.face_detector = None
+                self._batch = None
         
     def initialize_camera(self):
         """Initialize camera capture"""
@@ -47,10 +143,27 @@ class MoodDetector:
             self.cap = cv2.VideoCapture(self.camera_index)
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.frame_width)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.frame_height)
-            
+            # Keep the driver buffer at a single frame so retrieve() never
+            # returns stale frames queued up by V4L2/USB
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            # Request raw YUYV and skip the backend's BGR conversion:
+            # detection only needs the Y (luma) plane, and BGR is produced
+            # once per frame actually shown. Conversion is only disabled
+            # when the driver confirms the YUYV format took effect —
+            # otherwise (e.g. MJPG-only cams) frames would arrive as raw
+            # buffers that neither the luma-plane path nor imshow can use.
+            yuyv = cv2.VideoWriter_fourcc(*'YUYV')
+            if self.cap.set(cv2.CAP_PROP_FOURCC, yuyv) and \
+                    int(self.cap.get(cv2.CAP_PROP_FOURCC)) == yuyv:
+                self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+
             if not self.cap.isOpened():
                 raise Exception("Could not open camera")
-                
+
+            self._running = True
+            self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+            self._capture_thread.start()
+
             logger.info("Camera initialized successfully")
             return True
             
@@ -58,44 +171,84 @@ class MoodDetector:
             logger.error(f"Failed to initialize camera: {e}")
             return False
     
-    def detect_faces_and_features(self, frame):
+    def _capture_loop(self):
+        """
+        Continuously pull frames from the camera on a background thread
+
+        Keeps draining the capture buffer so the detection thread always
+        reads the freshest frame from the single-slot `self._latest` instead
+        of blocking on USB/V4L2 I/O.
+        """
+        while self._running:
+            if not self.cap.grab():
+                time.sleep(0.01)
+                continue
+
+            ret, frame = self.cap.retrieve()
+            if ret:
+                with self._frame_lock:
+                    self._latest = frame
+
+    def detect_faces_and_features(self, frame, gray=None):
         """
         Detect faces and basic features using OpenCV
-        
+
         Args:
             frame: OpenCV frame/image
-            
+            gray: Precomputed grayscale frame (e.g. the raw YUYV luma plane),
+                  or None to convert from BGR
+
         Returns:
             dict: Dictionary with face detection results
         """
         if self.face_cascade is None:
             return {'faces': 0, 'smiles': 0, 'eyes': 0}
-        
+
         try:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            
-            faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
-            
+            if gray is None:
+                if self._use_opencl:
+                    # Keep conversion and resize on the OpenCL device; only
+                    # download the grayscale image for the Python ROI logic
+                    ugray = cv2.cvtColor(cv2.UMat(frame), cv2.COLOR_BGR2GRAY)
+                    small = cv2.resize(ugray, (0, 0), fx=0.5, fy=0.5)
+                    gray = ugray.get()
+                else:
+                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                    small = cv2.resize(gray, (0, 0), fx=0.5, fy=0.5)
+            else:
+                small = cv2.resize(gray, (0, 0), fx=0.5, fy=0.5)
+
+            # Run the dominant face pass at half resolution (4x fewer pixels)
+            # and scale the boxes back up; minSize skips pyramid levels for
+            # faces under 80px at full resolution
+            faces = self.face_cascade.detectMultiScale(
+                small, 1.3, 5, minSize=(40, 40)
+            )
+
             smiles = 0
             eyes = 0
-            
+
+            smile_cascade = self.smile_cascade
+            eye_cascade = self.eye_cascade
+
             for (x, y, w, h) in faces:
+                x, y, w, h = x * 2, y * 2, w * 2, h * 2
                 roi_gray = gray[y:y+h, x:x+w]
                 roi_color = frame[y:y+h, x:x+w]
-                
+
                 cv2.rectangle(frame, (x, y), (x+w, y+h), (255, 0, 0), 2)
-                
-                if self.smile_cascade is not None:
-                    smile_rects = self.smile_cascade.detectMultiScale(roi_gray, 1.8, 20)
+
+                if smile_cascade is not None:
+                    smile_rects = smile_cascade.detectMultiScale(roi_gray, 1.8, 20)
                     smiles += len(smile_rects)
-                    
+
                     for (sx, sy, sw, sh) in smile_rects:
                         cv2.rectangle(roi_color, (sx, sy), (sx+sw, sy+sh), (0, 255, 0), 2)
-                
-                if self.eye_cascade is not None:
-                    eye_rects = self.eye_cascade.detectMultiScale(roi_gray)
+
+                if eye_cascade is not None:
+                    eye_rects = eye_cascade.detectMultiScale(roi_gray)
                     eyes += len(eye_rects)
-                    
+
                     for (ex, ey, ew, eh) in eye_rects:
                         cv2.rectangle(roi_color, (ex, ey), (ex+ew, ey+eh), (0, 255, 255), 2)
             
@@ -115,15 +268,10 @@ class MoodDetector:
         Returns:
             str: Detected emotion or None
         """
-        if features['faces'] == 0:
+        index = _emotion_index(features['faces'], features['smiles'], features['eyes'])
+        if index < 0:
             return None
-        
-        if features['smiles'] > 0:
-            return 'happy'
-        elif features['eyes'] >= 2:
-            return 'neutral'
-        else:
-            return 'sad'
+        return self.emotions[index]
     
     def demo_emotion_rotation(self):
         """
@@ -142,25 +290,96 @@ class MoodDetector:
         
         return self.emotions[self.current_emotion_index]
     
-    def detect_mood_from_frame(self, frame):
+    def _detect_mood_dnn(self, frame, gray=None):
+        """
+        Detect emotion using the batched ONNX model
+
+        Face crops from consecutive frames are accumulated into a preallocated
+        ring buffer; once the buffer has filled, every call runs a single
+        batched inference over the last EMOTION_BATCH_SIZE crops and returns
+        the majority emotion.
+
+        Args:
+            frame: OpenCV frame/image
+            gray: Precomputed grayscale frame, or None to convert from BGR
+
+        Returns:
+            str: Detected emotion or None if no face or buffer not yet full
+        """
+        try:
+            self.face_detector.setInputSize((frame.shape[1], frame.shape[0]))
+            _, faces = self.face_detector.detect(frame)
+            if faces is None or len(faces) == 0:
+                return None
+
+            x, y, w, h = faces[0][:4].astype(int)
+            x, y = max(x, 0), max(y, 0)
+            if w <= 0 or h <= 0:
+                return None
+
+            if gray is not None:
+                face_gray = gray[y:y+h, x:x+w]
+            else:
+                face_gray = cv2.cvtColor(frame[y:y+h, x:x+w], cv2.COLOR_BGR2GRAY)
+            crop = cv2.resize(face_gray, (EMOTION_INPUT_SIZE, EMOTION_INPUT_SIZE))
+
+            cv2.rectangle(frame, (x, y), (x+w, y+h), (255, 0, 0), 2)
+
+            self._batch[self._batch_idx, 0] = crop.astype(np.float32)
+            self._batch_idx = (self._batch_idx + 1) % EMOTION_BATCH_SIZE
+            if self._batch_idx == 0:
+                self._batch_full = True
+            if not self._batch_full:
+                return None
+
+            outputs = self.session.run(None, {self._input_name: self._batch})[0]
+            labels = np.argmax(outputs, axis=1)
+            majority = np.bincount(labels).argmax()
+            self._dnn_failures = 0
+            return DNN_EMOTIONS[majority]
+
+        except Exception as e:
+            logger.warning(f"Error during DNN emotion inference: {e}")
+            # A model that keeps failing will fail on every frame; disable
+            # it so detect_mood_from_frame falls back to the cascades
+            self._dnn_failures += 1
+            if self._dnn_failures >= DNN_FAILURE_LIMIT:
+                logger.warning("DNN inference failed %d times, falling back to cascades",
+                               self._dnn_failures)
+                self.session = None
+            return None
+
+    def detect_mood_from_frame(self, frame, gray=None):
         """
         Detect mood from a single frame
-        
+
         Args:
             frame: OpenCV frame/image
-            
+            gray: Precomputed grayscale frame, or None to convert from BGR
+
         Returns:
             str: Detected emotion or None if no face detected
         """
         try:
-            features = self.detect_faces_and_features(frame)
-            
-            if features['faces'] > 0:
-                emotion = self.simple_emotion_logic(features)
-                
+            if self.session is not None:
+                emotion = self._detect_mood_dnn(frame, gray)
                 if emotion:
-                    logger.info(f"OpenCV detected emotion: {emotion}")
+                    logger.info(f"DNN detected emotion: {emotion}")
                     return emotion
+                if not self._batch_full and self._batch_idx > 0:
+                    # A face is on camera but the batch is still filling:
+                    # report "no detection yet" instead of leaking demo
+                    # labels into the caller's stability window
+                    return None
+            else:
+                features = self.detect_faces_and_features(frame, gray)
+
+                if features['faces'] > 0:
+                    emotion = self.simple_emotion_logic(features)
+
+                    if emotion:
+                        logger.info(f"OpenCV detected emotion: {emotion}")
+                        return emotion
             
             demo_emotion = self.demo_emotion_rotation()
             logger.info(f"Demo mode emotion: {demo_emotion}")
@@ -170,42 +389,69 @@ class MoodDetector:
             logger.warning(f"Could not detect emotion from frame: {e}")
             return None
     
-    def capture_and_detect(self, frame_skip=30):
+    def capture_and_detect(self, target_fps=10, preview_fps=30):
         """
         Capture frame from camera and detect mood
-        
+
+        Preview frames are produced at preview_fps for a smooth display;
+        the heavier detection pipeline only runs at target_fps.
+
         Args:
-            frame_skip (int): Process every nth frame for performance
-            
+            target_fps (int): Maximum number of frames analyzed per second
+            preview_fps (int): Maximum number of frames returned per second
+
         Returns:
-            tuple: (detected_mood, frame) or (None, None) if failed
+            tuple: (detected_mood, frame, did_process); frame is None when
+                   throttled, did_process is True only when detection ran
         """
         if not self.cap or not self.cap.isOpened():
             logger.error("Camera not initialized")
-            return None, None
-        
+            return None, None, False
+
+        # Wall-clock gates: throttled calls cost nothing, not even a flip
+        now = time.monotonic()
+        if now - self._last_preview < 1.0 / preview_fps:
+            return None, None, False
+        self._last_preview = now
+
+        did_process = now - self._last_proc >= 1.0 / target_fps
+        if did_process:
+            self._last_proc = now
+
         try:
-            ret, frame = self.cap.read()
-            if not ret:
-                logger.error("Failed to read frame from camera")
-                return None, None
-            
-            frame = cv2.flip(frame, 1)
-            
-            self.frame_count += 1
-            if self.frame_count % frame_skip != 0:
-                return None, frame
-            
-            mood = self.detect_mood_from_frame(frame)
-            
-            return mood, frame
-            
+            with self._frame_lock:
+                frame = self._latest
+            if frame is None:
+                # Capture thread has not produced a frame yet
+                return None, None, False
+
+            if frame.ndim == 3 and frame.shape[2] == 2:
+                # Raw YUYV: the Y plane is a zero-copy luma view, and BGR is
+                # produced once only because this frame gets annotated/shown
+                gray = frame[:, :, 0]
+                frame = cv2.cvtColor(frame, cv2.COLOR_YUV2BGR_YUYV)
+            else:
+                gray = None
+
+            mood = self.detect_mood_from_frame(frame, gray) if did_process else None
+
+            # Mirror for the selfie view with a zero-copy negative-stride
+            # view, materialized once only because the frame is displayed;
+            # detection above never pays for a flip
+            frame = np.ascontiguousarray(frame[:, ::-1])
+
+            return mood, frame, did_process
+
         except Exception as e:
             logger.error(f"Error during capture and detection: {e}")
-            return None, None
+            return None, None, False
     
     def release(self):
         """Release camera resources"""
+        self._running = False
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout=1.0)
+            self._capture_thread = None
         if self.cap:
             self.cap.release()
             cv2.destroyAllWindows()
@@ -1,16 +1,74 @@
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
+from spotipy.exceptions import SpotifyException
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import webbrowser
+import asyncio
 import random
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+# orjson only speeds up the aiohttp search path below; spotipy parses
+# responses via requests' response.json(), which can't be redirected at
+# the orjson decoder without wrapping the whole session
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+HTTP_CACHE_PATH = '.spotify_http_cache'
+HTTP_CACHE_TTL = 86400  # seconds
+
+MAX_DESCRIPTION = 200  # Characters of playlist description kept
+QUALITY_MIN_TRACKS = 10  # Playlists at least this long count as "quality"
+
+SEARCH_CACHE_PATH = '.spotify_search_cache'
+SEARCH_CACHE_TTL = 86400  # seconds; playlists are stable for hours/days
+
+SEARCH_ENDPOINT = 'https://api.spotify.com/v1/search'
+VALID_URL_PREFIXES = ('https://open.spotify.com/', 'spotify:')
+SEARCH_CONCURRENCY = 8  # Parallel searches in flight; keeps rate limits happy
+
+class PlaylistInfo(NamedTuple):
+    """Extracted playlist record; a slim tuple instead of a per-playlist dict"""
+    name: str
+    url: str
+    description: str
+    tracks_count: int
+    owner: str
+    image: str
+
 class SpotifyClient:
     """Class for interacting with Spotify Web API with enhanced error handling"""
-    
+
+    __slots__ = ('client_id', 'client_secret', 'redirect_uri', 'sp',
+                 '_http_session', '_token_expiry', '_browser',
+                 '_featured_cache', '_featured_lock',
+                 '_search_cache', '_memory_cache', '_pool')
+
     def __init__(self, client_id, client_secret, redirect_uri):
         """
         Initialize Spotify client
@@ -24,224 +82,496 @@ class SpotifyClient:
         self.client_secret = client_secret
         self.redirect_uri = redirect_uri
         self.sp = None
-        
+        self._http_session = None
+        self._token_expiry = 0
+        self._browser = None
+        self._featured_cache = None
+        self._featured_lock = threading.Lock()
+
+        # Extracted search results keyed by (keywords, limit, target_count,
+        # market);
+        # diskcache persists them across runs when installed, otherwise a
+        # process-local dict with the same TTL is used
+        self._search_cache = diskcache.Cache(SEARCH_CACHE_PATH) if diskcache is not None else None
+        self._memory_cache = {}
+
+        # Validation/extraction of one keyword's results runs on this pool
+        # so it overlaps with the HTTP responses still streaming in
+        self._pool = ThreadPoolExecutor(max_workers=8)
+
+    def _build_http_session(self):
+        """
+        Build the HTTP session shared by all Spotify API calls
+
+        Uses a SQLite-backed requests_cache session with a 24h TTL when the
+        package is installed, so repeated searches are served from disk
+        across runs; falls back to a plain requests.Session otherwise.
+        Either way the session pools connections to api.spotify.com, so a
+        batch of keyword searches pays one TLS handshake instead of one per
+        request, and retries transient failures with backoff.
+
+        Returns:
+            requests.Session: Session to hand to spotipy
+        """
+        if requests_cache is not None:
+            session = requests_cache.CachedSession(
+                HTTP_CACHE_PATH, backend='sqlite', expire_after=HTTP_CACHE_TTL
+            )
+        else:
+            session = requests.Session()
+
+        # 429 is deliberately absent: _search_with_retry owns rate-limit
+        # handling, and retrying it here too would stack both layers'
+        # sleeps and multiply the request count
+        retry = Retry(total=3, backoff_factor=0.3,
+                      status_forcelist=(500, 502, 503, 504))
+        session.mount('https://', HTTPAdapter(
+            pool_connections=4, pool_maxsize=32, max_retries=retry
+        ))
+        return session
+
+    def _search_cache_get(self, key):
+        """
+        Look up cached search results
+
+        Args:
+            key (tuple): Cache key built from keywords, limit, target count and market
+
+        Returns:
+            list: Cached PlaylistInfo records or None on miss/expiry
+        """
+        if self._search_cache is not None:
+            return self._search_cache.get(key)
+        entry = self._memory_cache.get(key)
+        if entry and time.time() < entry[0]:
+            return entry[1]
+        return None
+
+    def _search_cache_set(self, key, playlists):
+        """
+        Store extracted search results with a TTL
+
+        Args:
+            key (tuple): Cache key built from keywords, limit, target count and market
+            playlists (list): Already-extracted PlaylistInfo records
+        """
+        if self._search_cache is not None:
+            self._search_cache.set(key, playlists, expire=SEARCH_CACHE_TTL)
+        else:
+            self._memory_cache[key] = (time.time() + SEARCH_CACHE_TTL, playlists)
+
+    def clear_cache(self):
+        """Drop cached search results to force fresh API queries"""
+        if self._search_cache is not None:
+            self._search_cache.clear()
+        self._memory_cache.clear()
+
+    def close(self):
+        """Release the worker pool, HTTP session and on-disk cache"""
+        self._pool.shutdown(wait=False)
+        if self._http_session is not None:
+            self._http_session.close()
+            self._http_session = None
+        if self._search_cache is not None:
+            self._search_cache.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def authenticate(self):
         """Authenticate with Spotify API with enhanced error handling"""
+        return self._ensure_auth()
+
+    def _ensure_auth(self):
+        """
+        Build the authenticated client on first use
+
+        Called lazily from the API entry points so that constructing a
+        SpotifyClient costs nothing; the OAuth flow and HTTP session are
+        set up on the first real call. A still-valid cached token means
+        no network traffic at all, and the current_user() welcome probe
+        only runs when INFO logging is enabled.
+
+        Returns:
+            bool: True if an authenticated client is available
+        """
+        if self.sp is not None:
+            return True
+
         try:
-            if not all([self.client_id, self.client_secret, self.redirect_uri]):
+            if not (self.client_id and self.client_secret and self.redirect_uri):
                 logger.error("Missing Spotify credentials")
                 return False
-            
-            if (self.client_id == 'your_client_id_here' or 
-                self.client_secret == 'your_client_secret_here'):
+
+            if (self.client_id == 'your_client_id_here' or
+                    self.client_secret == 'your_client_secret_here'):
                 logger.error("Please update Spotify credentials in .env file")
                 return False
-            
+
             auth_manager = SpotifyOAuth(
                 client_id=self.client_id,
                 client_secret=self.client_secret,
                 redirect_uri=self.redirect_uri,
                 scope="user-library-read playlist-read-private playlist-read-collaborative",
-                show_dialog=True,
+                show_dialog=False,
+                open_browser=False,
                 cache_path=".spotify_cache"
             )
-            
-            self.sp = spotipy.Spotify(auth_manager=auth_manager)
-            
-            try:
-                user = self.sp.current_user()
-                if user and user.get('display_name'):
-                    logger.info(f"Successfully authenticated as: {user['display_name']}")
-                elif user and user.get('id'):
-                    logger.info(f"Successfully authenticated as user: {user['id']}")
-                else:
-                    logger.info("Successfully authenticated with Spotify")
-            except Exception as e:
-                logger.warning(f"Authentication successful but couldn't get user info: {e}")
-            
+
+            self._http_session = self._build_http_session()
+            self.sp = spotipy.Spotify(auth_manager=auth_manager, requests_session=self._http_session)
+
+            # Warm start: a still-valid cached token means no browser
+            # redirect and no current_user() probe are needed
+            cached_token = auth_manager.validate_token(
+                auth_manager.cache_handler.get_cached_token()
+            )
+            if cached_token:
+                self._token_expiry = cached_token.get('expires_at', 0)
+                logger.info("Reusing cached Spotify token")
+                self._start_featured_prefetch()
+                return True
+
+            if logger.isEnabledFor(logging.INFO):
+                try:
+                    user = self.sp.current_user()
+                    token = auth_manager.cache_handler.get_cached_token() or {}
+                    self._token_expiry = token.get('expires_at', 0)
+                    if user and user.get('display_name'):
+                        logger.info(f"Successfully authenticated as: {user['display_name']}")
+                    elif user and user.get('id'):
+                        logger.info(f"Successfully authenticated as user: {user['id']}")
+                    else:
+                        logger.info("Successfully authenticated with Spotify")
+                except Exception as e:
+                    logger.warning(f"Authentication successful but couldn't get user info: {e}")
+
+            self._start_featured_prefetch()
             return True
-            
+
         except Exception as e:
             logger.error(f"Spotify authentication failed: {e}")
             logger.info("Make sure your Spotify credentials are correct and the redirect URI matches your app settings")
             return False
-    
-    def _is_valid_playlist(self, playlist):
+
+    def _start_featured_prefetch(self):
+        """Warm the featured-playlists cache on a background thread"""
+        threading.Thread(target=self._prefetch_featured, daemon=True).start()
+
+    def _prefetch_featured(self):
         """
-        Validate playlist object to prevent None errors
-        
-        Args:
-            playlist (dict): Playlist object from Spotify API
-            
-        Returns:
-            bool: True if playlist is valid, False otherwise
+        Populate the featured-playlists cache used by the fallback path
+
+        Runs at authenticate time so that when a mood search comes up empty
+        the fallback answer is already in memory instead of costing a fresh
+        network round trip.
         """
-        if not playlist:
-            return False
-        
-        required_fields = ['name', 'external_urls', 'tracks', 'owner']
-        for field in required_fields:
-            if not playlist.get(field):
-                return False
-        
-        tracks = playlist.get('tracks', {})
-        if not isinstance(tracks, dict) or tracks.get('total', 0) == 0:
-            return False
-        
-        external_urls = playlist.get('external_urls', {})
-        if not isinstance(external_urls, dict) or not external_urls.get('spotify'):
-            return False
-        
-        owner = playlist.get('owner', {})
-        if not isinstance(owner, dict):
-            return False
-        
-        return True
-    
+        try:
+            featured = self.get_featured_playlists(limit=40)
+            with self._featured_lock:
+                self._featured_cache = featured
+        except Exception as e:
+            logger.debug("Featured playlist prefetch failed: %s", e)
+
     def _extract_playlist_info(self, playlist):
         """
-        Safely extract playlist information with comprehensive error handling
-        
+        Extract and validate playlist information in a single pass
+
+        Required fields are read with direct subscripting inside one
+        try/except, so the common case (a well-formed playlist) pays no
+        isinstance or repeated .get() probes; anything missing or
+        malformed simply returns None.
+
         Args:
             playlist (dict): Playlist object from Spotify API
-            
+
         Returns:
-            dict: Extracted playlist information or None if extraction fails
+            PlaylistInfo: Extracted playlist record or None if invalid
         """
         try:
-            name = playlist.get('name', 'Unknown Playlist')
-            url = playlist.get('external_urls', {}).get('spotify', '')
+            name = playlist['name']
+            url = playlist['external_urls']['spotify']
+            tracks_count = playlist['tracks']['total']
+            owner = playlist['owner']
+            if not name or not url or not tracks_count:
+                return None
+
             description = playlist.get('description') or 'No description available'
-            
-            tracks = playlist.get('tracks', {})
-            tracks_count = tracks.get('total', 0) if isinstance(tracks, dict) else 0
-            
-            owner = playlist.get('owner', {})
-            owner_name = 'Unknown User'
-            if isinstance(owner, dict):
-                owner_name = owner.get('display_name') or owner.get('id', 'Unknown User')
-            
-            images = playlist.get('images', [])
-            image_url = ''
-            if isinstance(images, list) and images:
-                first_image = images[0]
-                if isinstance(first_image, dict):
-                    image_url = first_image.get('url', '')
-            
-            playlist_info = {
-                'name': name,
-                'url': url,
-                'description': description[:200] + '...' if len(description) > 200 else description,
-                'tracks_count': tracks_count,
-                'owner': owner_name,
-                'image': image_url
-            }
-            
-            return playlist_info
-            
-        except Exception as e:
-            logger.error(f"Error extracting playlist info: {e}")
+            if len(description) > MAX_DESCRIPTION:
+                description = description[:MAX_DESCRIPTION] + '...'
+
+            images = playlist.get('images')
+            image_url = images[0].get('url', '') if images else ''
+
+            return PlaylistInfo(
+                name=name,
+                url=url,
+                description=description,
+                tracks_count=tracks_count,
+                owner=owner.get('display_name') or owner.get('id', 'Unknown User'),
+                image=image_url
+            )
+
+        except (KeyError, TypeError, AttributeError, IndexError):
             return None
     
-    def _remove_duplicates(self, playlists):
+    def _search_with_retry(self, **kwargs):
         """
-        Remove duplicate playlists based on URL
-        
+        Call sp.search, retrying rate-limited requests with backoff
+
+        A 429 used to fall into the generic exception handler and silently
+        drop that keyword's results; instead honor Spotify's Retry-After
+        header (falling back to exponential backoff) for up to 4 attempts.
+
         Args:
-            playlists (list): List of playlist dictionaries
-            
+            **kwargs: Arguments forwarded to spotipy's search
+
         Returns:
-            list: List of unique playlists
+            dict: Raw search response
         """
-        unique_playlists = []
-        seen_urls = set()
-        
-        for playlist in playlists:
-            if not playlist or not isinstance(playlist, dict):
-                continue
-                
-            url = playlist.get('url', '')
-            if url and url not in seen_urls:
-                unique_playlists.append(playlist)
-                seen_urls.add(url)
-        
-        return unique_playlists
-    
-    def search_mood_playlists(self, mood_keywords, limit=10):
+        for attempt in range(4):
+            try:
+                return self.sp.search(**kwargs)
+            except SpotifyException as e:
+                if e.http_status != 429 or attempt == 3:
+                    raise
+                retry_after = int((e.headers or {}).get('Retry-After', 2 ** attempt))
+                logger.warning(f"Rate limited by Spotify, retrying in {retry_after}s")
+                time.sleep(retry_after)
+
+    def _paginate_search(self, query, max_items=100):
+        """
+        Collect playlist search results for a query across pages
+
+        Walks offset=0,50,... until a short page or max_items is reached,
+        so one query gets full coverage in a single pass instead of the
+        caller firing a second, broader batch of searches when a fixed
+        limit comes up short.
+
+        Args:
+            query (str): Prebuilt search query string
+            max_items (int): Maximum number of raw items to collect
+
+        Returns:
+            list: Raw playlist items from all fetched pages
+        """
+        items = []
+        offset = 0
+        while offset < max_items:
+            page_size = min(50, max_items - offset)  # Spotify max is 50
+            results = self._search_with_retry(
+                q=query,
+                type='playlist',
+                limit=page_size,
+                offset=offset,
+                market='US'  # Add market for better results
+            )
+            page = results['playlists']['items'] if results else []
+            items.extend(page)
+            if len(page) < page_size:
+                break
+            offset += page_size
+        return items
+
+    def _collect_unique(self, items, all_playlists, seen_urls):
+        """
+        Extract raw items on the worker pool and append unseen playlists
+
+        Args:
+            items (list): Raw playlist items from the API
+            all_playlists (list): Output list being accumulated
+            seen_urls (set): URLs already collected
+        """
+        for info in self._pool.map(self._extract_playlist_info, items):
+            if info and info.url not in seen_urls:
+                seen_urls.add(info.url)
+                all_playlists.append(info)
+
+    def _search_keyword(self, keyword, limit):
+        """
+        Search a single keyword through spotipy (serial fallback path)
+
+        Args:
+            keyword (str): Search keyword
+            limit (int): Maximum number of playlists to collect
+
+        Returns:
+            dict: Search-response-shaped dict, or the raised exception
+        """
+        logger.debug("Searching playlists for keyword: %s", keyword)
+        try:
+            items = self._paginate_search(f'"{keyword}"', max_items=limit)
+            time.sleep(0.1)
+            return {'playlists': {'items': items}}
+        except Exception as e:
+            return e
+
+    def _search_keywords_concurrent(self, keywords, limit):
+        """
+        Search all keywords concurrently against the /v1/search endpoint
+
+        The workload is network-bound, so dispatching every keyword at once
+        over one aiohttp session cuts wall time to roughly the slowest
+        single request; a semaphore bounds in-flight requests in place of
+        the serial path's sleep between searches.
+
+        Args:
+            keywords (list): Search keywords
+            limit (int): Maximum number of playlists to request per keyword
+
+        Returns:
+            list: Per-keyword raw search responses (exceptions on failure),
+                  in the same order as keywords
+        """
+        token = self.sp.auth_manager.get_access_token(as_dict=False)
+
+        async def _run():
+            semaphore = asyncio.Semaphore(SEARCH_CONCURRENCY)
+
+            async def _search_one(session, keyword):
+                params = {
+                    'q': f'"{keyword}"',
+                    'type': 'playlist',
+                    'limit': min(limit, 50),
+                    'market': 'US'
+                }
+                # Honor Retry-After on 429 like _search_with_retry does on
+                # the serial path, so a rate limit delays the keyword
+                # instead of silently dropping its results
+                for attempt in range(4):
+                    async with semaphore:
+                        async with session.get(SEARCH_ENDPOINT, params=params) as resp:
+                            if resp.status == 429 and attempt < 3:
+                                retry_after = int(resp.headers.get('Retry-After', 2 ** attempt))
+                                logger.warning(f"Rate limited by Spotify, retrying in {retry_after}s")
+                            else:
+                                resp.raise_for_status()
+                                if orjson is not None:
+                                    return orjson.loads(await resp.read())
+                                return await resp.json()
+                    await asyncio.sleep(retry_after)
+
+            connector = aiohttp.TCPConnector(limit_per_host=64)
+            headers = {'Authorization': f'Bearer {token}'}
+            async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+                return await asyncio.gather(
+                    *(_search_one(session, keyword) for keyword in keywords),
+                    return_exceptions=True
+                )
+
+        return asyncio.run(_run())
+
+    def _enough_quality(self, playlists, target_count):
+        """
+        Check whether enough quality playlists have been collected
+
+        Args:
+            playlists (list): Collected PlaylistInfo records
+            target_count (int): Quality playlists needed, or None to disable
+
+        Returns:
+            bool: True once target_count playlists meet QUALITY_MIN_TRACKS
+        """
+        if target_count is None:
+            return False
+        quality = sum(1 for p in playlists if p.tracks_count >= QUALITY_MIN_TRACKS)
+        return quality >= target_count
+
+    def search_mood_playlists(self, mood_keywords, limit=10, target_count=None):
         """
         Search for playlists based on mood keywords with robust error handling
-        
+
         Args:
             mood_keywords (list): List of keywords related to the mood
             limit (int): Maximum number of playlists to search per keyword
-            
+            target_count (int): Stop searching once this many quality
+                                playlists are collected (None searches all)
+
         Returns:
-            list: List of playlist dictionaries
+            list: List of PlaylistInfo records
         """
-        if not self.sp:
+        if not self._ensure_auth():
             logger.error("Spotify client not authenticated")
             return []
         
-        if not mood_keywords or not isinstance(mood_keywords, list):
+        if not mood_keywords or not isinstance(mood_keywords, (list, tuple)):
             logger.error("Invalid mood keywords provided")
             return []
         
+        # target_count is part of the key: an early-stopped search returns
+        # a truncated list that must not be served to callers asking for
+        # the full search
+        cache_key = (tuple(mood_keywords), limit, target_count, 'US')
+        cached = self._search_cache_get(cache_key)
+        if cached is not None:
+            logger.debug("Using %d cached playlists for keywords: %s", len(cached), list(mood_keywords))
+            return cached
+
         try:
             all_playlists = []
-            
-            for keyword in mood_keywords:
-                if not keyword or not isinstance(keyword, str):
+            seen_urls = set()  # Dedup inline: every appended info has a URL
+            keywords = [k for k in mood_keywords if k and isinstance(k, str)]
+            if not keywords:
+                return []
+
+            # One request matching any keyword: the search endpoint accepts
+            # boolean OR, so N round trips collapse into a single
+            # relevance-ranked query
+            or_query = ' OR '.join(f'"{k}"' for k in keywords)
+            logger.debug("Searching playlists with combined query: %s", or_query)
+            try:
+                items = self._paginate_search(or_query, max_items=limit)
+                self._collect_unique(items, all_playlists, seen_urls)
+            except Exception as e:
+                logger.warning(f"Combined search failed: {e}")
+
+            if self._enough_quality(all_playlists, target_count) or \
+                    (target_count is None and len(all_playlists) >= 5):
+                logger.info("Found %d unique playlists total", len(all_playlists))
+                self._search_cache_set(cache_key, all_playlists)
+                return all_playlists
+
+            # Fallback: the combined query came up short, search keywords
+            # individually
+            if aiohttp is not None:
+                results_by_keyword = self._search_keywords_concurrent(keywords, limit)
+            else:
+                results_by_keyword = [self._search_keyword(k, limit) for k in keywords]
+
+            for keyword, results in zip(keywords, results_by_keyword):
+                if isinstance(results, Exception):
+                    logger.warning(f"Error searching for keyword '{keyword}': {results}")
                     continue
-                    
-                logger.info(f"Searching playlists for keyword: {keyword}")
-                
+
+                # Spotipy returns parsed JSON with a stable schema; one
+                # subscripting guard replaces the per-fragment type checks
                 try:
-                    results = self.sp.search(
-                        q=f'"{keyword}"',  # Use quotes for better matching
-                        type='playlist',
-                        limit=min(limit, 50),  # Spotify max is 50
-                        market='US'  # Add market for better results
-                    )
-                    
-                    if not results or not isinstance(results, dict):
-                        logger.warning(f"No results returned for keyword: {keyword}")
-                        continue
-                    
-                    playlists_data = results.get('playlists', {})
-                    if not isinstance(playlists_data, dict):
-                        logger.warning(f"Invalid playlists data for keyword: {keyword}")
-                        continue
-                    
-                    playlists = playlists_data.get('items', [])
-                    if not isinstance(playlists, list):
-                        logger.warning(f"Invalid playlists items for keyword: {keyword}")
-                        continue
-                    
-                    if not playlists:
-                        logger.info(f"No playlists found for keyword: {keyword}")
-                        continue
-                    
-                    logger.info(f"Found {len(playlists)} playlists for keyword: {keyword}")
-                    
-                    for playlist in playlists:
-                        # Comprehensive validation
-                        if not self._is_valid_playlist(playlist):
-                            continue
-                        
-                        playlist_info = self._extract_playlist_info(playlist)
-                        if playlist_info and playlist_info.get('url'):
-                            all_playlists.append(playlist_info)
-                    
-                    time.sleep(0.1)
-                        
-                except Exception as e:
-                    logger.warning(f"Error searching for keyword '{keyword}': {e}")
+                    playlists = results['playlists']['items']
+                except (KeyError, TypeError):
+                    logger.warning(f"No results returned for keyword: {keyword}")
                     continue
-            
-            unique_playlists = self._remove_duplicates(all_playlists)
-            logger.info(f"Found {len(unique_playlists)} unique playlists total")
-            
-            return unique_playlists
+
+                if not playlists:
+                    logger.debug("No playlists found for keyword: %s", keyword)
+                    continue
+
+                logger.debug("Found %d playlists for keyword: %s", len(playlists), keyword)
+
+                self._collect_unique(playlists, all_playlists, seen_urls)
+
+                if self._enough_quality(all_playlists, target_count):
+                    logger.debug("Early stop: enough quality playlists collected")
+                    break
+
+            logger.info("Found %d unique playlists total", len(all_playlists))
+
+            if all_playlists:
+                self._search_cache_set(cache_key, all_playlists)
+
+            return all_playlists
             
         except Exception as e:
             logger.error(f"Error in search_mood_playlists: {e}")
@@ -255,33 +585,37 @@ class SpotifyClient:
             mood_keywords (list): List of keywords related to the mood
             
         Returns:
-            dict: Recommended playlist information or None
+            PlaylistInfo: Recommended playlist or None
         """
         if not mood_keywords:
             logger.warning("No mood keywords provided")
             return None
         
         try:
-            playlists = self.search_mood_playlists(mood_keywords, limit=20)
-            
+            playlists = self.search_mood_playlists(mood_keywords, limit=100, target_count=10)
+
             if not playlists:
-                logger.warning("No playlists found for the given mood keywords")
-                # Try with a broader search
-                logger.info("Attempting broader search...")
-                broader_keywords = ['music', 'playlist', 'songs']
-                playlists = self.search_mood_playlists(broader_keywords, limit=10)
-            
+                # Fall back to featured playlists, prefetched at
+                # authenticate time so this path is usually instant
+                logger.warning("No playlists found for mood keywords, falling back to featured")
+                with self._featured_lock:
+                    playlists = list(self._featured_cache) if self._featured_cache else []
+                if not playlists:
+                    playlists = self.get_featured_playlists(limit=40)
+
             if not playlists:
-                logger.error("No playlists found even with broader search")
+                logger.error("No playlists found even with featured fallback")
                 return None
             
-            quality_playlists = [p for p in playlists if p.get('tracks_count', 0) >= 10]
-            
-            if not quality_playlists:
-                quality_playlists = playlists  # Fall back to any playlist
-            
-            recommended_playlist = random.choice(quality_playlists)
-            logger.info(f"Recommended playlist: {recommended_playlist.get('name', 'Unknown')}")
+            # Weight selection by tracks above the quality floor in one
+            # pass, biasing toward richer playlists without building a
+            # filtered intermediate list
+            weights = [max(p.tracks_count - (QUALITY_MIN_TRACKS - 1), 0) for p in playlists]
+            if sum(weights) == 0:
+                recommended_playlist = random.choice(playlists)  # Fall back to any playlist
+            else:
+                recommended_playlist = random.choices(playlists, weights=weights, k=1)[0]
+            logger.info("Recommended playlist: %s", recommended_playlist.name)
             
             return recommended_playlist
             
@@ -301,11 +635,16 @@ class SpotifyClient:
             return False
         
         try:
-            if not playlist_url.startswith('https://open.spotify.com/'):
+            if not playlist_url.startswith(VALID_URL_PREFIXES):
                 logger.error(f"Invalid Spotify URL format: {playlist_url}")
                 return False
-            
-            webbrowser.open(playlist_url)
+
+            # Discover the browser backend once; webbrowser.open would
+            # re-read environment variables on every call
+            if self._browser is None:
+                self._browser = webbrowser.get()
+
+            self._browser.open_new_tab(playlist_url)
             logger.info(f"Opened playlist in browser: {playlist_url}")
             return True
             
@@ -321,32 +660,25 @@ class SpotifyClient:
             limit (int): Number of playlists to retrieve
             
         Returns:
-            list: List of featured playlist dictionaries
+            list: List of featured PlaylistInfo records
         """
-        if not self.sp:
+        if not self._ensure_auth():
             logger.error("Spotify client not authenticated")
             return []
         
         try:
             results = self.sp.featured_playlists(limit=limit)
-            
-            if not results or not isinstance(results, dict):
-                return []
-            
-            playlists_data = results.get('playlists', {})
-            if not isinstance(playlists_data, dict):
-                return []
-            
-            playlists = playlists_data.get('items', [])
-            if not isinstance(playlists, list):
+
+            try:
+                playlists = results['playlists']['items']
+            except (KeyError, TypeError):
                 return []
-            
+
             featured_playlists = []
             for playlist in playlists:
-                if self._is_valid_playlist(playlist):
-                    playlist_info = self._extract_playlist_info(playlist)
-                    if playlist_info:
-                        featured_playlists.append(playlist_info)
+                playlist_info = self._extract_playlist_info(playlist)
+                if playlist_info:
+                    featured_playlists.append(playlist_info)
             
             return featured_playlists
             
@@ -361,9 +693,14 @@ class SpotifyClient:
         Returns:
             bool: True if connection is working, False otherwise
         """
-        if not self.sp:
+        if not self._ensure_auth():
             return False
-        
+
+        # A locally known unexpired token means the connection is good
+        # without spending an HTTP round trip
+        if self._token_expiry and time.time() < self._token_expiry:
+            return True
+
         try:
             self.sp.current_user()
             return True